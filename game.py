@@ -8,95 +8,243 @@ Formal definition of:
 - Utility function (win/loss/draw)
 """
 
-from typing import List, Tuple, Optional
-from copy import deepcopy
+from typing import Iterator, List, Tuple, Optional
 
 # Constants for players and board
-EMPTY = " "
-PLAYER_X = "X"  # Human (or first player)
-PLAYER_O = "O"  # AI agent (or second player)
+# Players are +1 / -1 so the opponent of p is -p (negamax-friendly).
+EMPTY = 0
+PLAYER_X = 1  # Human (or first player)
+PLAYER_O = -1  # AI agent (or second player)
+SYMBOLS = {PLAYER_X: "X", PLAYER_O: "O", EMPTY: " "}
 BOARD_SIZE = 3
 
-# Win conditions: all possible lines (rows, columns, diagonals)
-WIN_LINES = [
-    [(0, 0), (0, 1), (0, 2)],  # Row 0
-    [(1, 0), (1, 1), (1, 2)],  # Row 1
-    [(2, 0), (2, 1), (2, 2)],  # Row 2
-    [(0, 0), (1, 0), (2, 0)],  # Col 0
-    [(0, 1), (1, 1), (2, 1)],  # Col 1
-    [(0, 2), (1, 2), (2, 2)],  # Col 2
-    [(0, 0), (1, 1), (2, 2)],  # Main diagonal
-    [(0, 2), (1, 1), (2, 0)],  # Anti-diagonal
+# Integer evaluation scale for search: results dominate any heuristic score,
+# which lies in [-HEURISTIC_MAX, HEURISTIC_MAX].
+WIN_SCORE = 1000
+LOSS_SCORE = -WIN_SCORE
+DRAW_SCORE = 0
+HEURISTIC_MAX = 100
+
+# Win conditions: all possible lines (rows, columns, diagonals), three flat
+# cell indices (r * BOARD_SIZE + c) per line.
+WIN_LINES_FLAT = (
+    0, 1, 2,  # Row 0
+    3, 4, 5,  # Row 1
+    6, 7, 8,  # Row 2
+    0, 3, 6,  # Col 0
+    1, 4, 7,  # Col 1
+    2, 5, 8,  # Col 2
+    0, 4, 8,  # Main diagonal
+    2, 4, 6,  # Anti-diagonal
+)
+_LINE_STARTS = range(0, len(WIN_LINES_FLAT), BOARD_SIZE)
+
+# Bitboard layout: cell (r, c) is bit r * BOARD_SIZE + c of a 9-bit integer.
+FULL_BOARD = (1 << (BOARD_SIZE * BOARD_SIZE)) - 1
+WIN_MASKS = tuple(
+    sum(1 << cell for cell in WIN_LINES_FLAT[i:i + BOARD_SIZE]) for i in _LINE_STARTS
+)
+# (row, col) view of the same lines, aligned with WIN_MASKS (e.g. for UI highlighting).
+WIN_LINES = tuple(
+    tuple(divmod(cell, BOARD_SIZE) for cell in WIN_LINES_FLAT[i:i + BOARD_SIZE])
+    for i in _LINE_STARTS
+)
+CELL_TO_RC = tuple(divmod(cell, BOARD_SIZE) for cell in range(BOARD_SIZE * BOARD_SIZE))
+# LEGAL_MOVES[occupied] lists the empty cell indices of an occupancy bitboard.
+LEGAL_MOVES = tuple(
+    tuple(cell for cell in range(BOARD_SIZE * BOARD_SIZE) if not occupied >> cell & 1)
+    for occupied in range(FULL_BOARD + 1)
+)
+
+# IS_WIN[bits] is 1 if the player owning `bits` has completed a line.
+IS_WIN = bytes(
+    1 if any(bits & mask == mask for mask in WIN_MASKS) else 0
+    for bits in range(FULL_BOARD + 1)
+)
+
+
+def _symmetries() -> List[Tuple[int, ...]]:
+    """The 8 board symmetries as cell permutations: perm[src_index] = dest_index."""
+    perms = []
+    cells = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
+    last = BOARD_SIZE - 1
+    for reflect in (False, True):
+        for turns in range(4):
+            perm = []
+            for r, c in cells:
+                if reflect:
+                    c = last - c
+                for _ in range(turns):
+                    r, c = c, last - r
+                perm.append(r * BOARD_SIZE + c)
+            perms.append(tuple(perm))
+    return perms
+
+
+# SYMMETRIES[s][i] is where cell i moves under symmetry s; SYM_INVERSE undoes it.
+SYMMETRIES = _symmetries()
+SYM_INVERSE = [tuple(perm.index(i) for i in range(len(perm))) for perm in SYMMETRIES]
+# SYM_TABLES[s][bits] is the bitboard `bits` transformed by symmetry s.
+SYM_TABLES = [
+    tuple(
+        sum(1 << perm[i] for i in range(len(perm)) if bits >> i & 1)
+        for bits in range(FULL_BOARD + 1)
+    )
+    for perm in SYMMETRIES
 ]
 
 
+def canonical_key(x: int, o: int) -> Tuple[int, int]:
+    """
+    Return (key, symmetry): the canonical position key, i.e. the smallest packed
+    (x << 9) | o over all 8 symmetries, and the index of the symmetry producing it.
+    """
+    best_key = -1
+    best_sym = 0
+    for sym, table in enumerate(SYM_TABLES):
+        key = (table[x] << 9) | table[o]
+        if best_key < 0 or key < best_key:
+            best_key = key
+            best_sym = sym
+    return best_key, best_sym
+
+
+# POPCOUNT[bits] is the number of set bits (cells taken) in a 9-bit board.
+POPCOUNT = bytes(bin(bits).count("1") for bits in range(FULL_BOARD + 1))
+
+
+def _line_score(n_perspective: int, n_opponent: int) -> int:
+    """Heuristic value of one line given how many cells each player holds on it."""
+    if n_opponent == 0:
+        if n_perspective == 2:
+            return 50   # one move from win
+        if n_perspective == 1:
+            return 10   # potential
+    if n_perspective == 0:
+        if n_opponent == 2:
+            return -50  # block opponent
+        if n_opponent == 1:
+            return -10
+    return 0
+
+
+# LINE_SCORE[n_perspective][n_opponent] is _line_score for that line.
+LINE_SCORE = tuple(tuple(_line_score(m, t) for t in range(4)) for m in range(4))
+# LINE_COUNTS[bits] holds, per win line, the number of cells `bits` occupies on it.
+LINE_COUNTS = tuple(
+    tuple(POPCOUNT[bits & mask] for mask in WIN_MASKS) for bits in range(FULL_BOARD + 1)
+)
+
+
+def line_heuristic(mine: int, theirs: int) -> int:
+    """
+    Heuristic score of a position given as the bitboards of the perspective
+    player (mine) and the opponent (theirs). See GameState.heuristic_eval.
+    """
+    score = sum(
+        LINE_SCORE[m][t] for m, t in zip(LINE_COUNTS[mine], LINE_COUNTS[theirs])
+    )
+    return max(-HEURISTIC_MAX, min(HEURISTIC_MAX, score))
+
+
+# Marks GameState._winner as not yet computed (None means "no winner").
+_UNCOMPUTED = object()
+
+
 class GameState:
     """
     Formal representation of a Tic-Tac-Toe game state.
-    State is immutable for search; we use copies when applying actions.
+    The board is two bitboards: x holds X's cells, o holds O's cells.
+    State is immutable for search; actions return a new state.
     """
 
+    __slots__ = ("x", "o", "current_player", "_winner")
+
     def __init__(
         self,
-        board: Optional[List[List[str]]] = None,
-        current_player: str = PLAYER_X,
+        x: int = 0,
+        o: int = 0,
+        current_player: int = PLAYER_X,
     ):
-        if board is None:
-            board = [[EMPTY] * BOARD_SIZE for _ in range(BOARD_SIZE)]
-        self.board = board
+        self.x = x
+        self.o = o
         self.current_player = current_player
+        self._winner: object = _UNCOMPUTED  # cached by _has_winner
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, GameState):
             return False
         return (
-            self.board == other.board and self.current_player == other.current_player
+            self.x == other.x
+            and self.o == other.o
+            and self.current_player == other.current_player
         )
 
     def __hash__(self) -> int:
-        return hash((tuple(tuple(row) for row in self.board), self.current_player))
+        return hash((self.x, self.o, self.current_player))
 
-    def get_opponent(self) -> str:
-        """Return the symbol of the opponent."""
-        return PLAYER_O if self.current_player == PLAYER_X else PLAYER_X
+    @property
+    def cells(self) -> Tuple[int, ...]:
+        """Flat, immutable view of the board: cell (r, c) is at index r * 3 + c."""
+        return tuple(self._cell(1 << i) for i in range(BOARD_SIZE * BOARD_SIZE))
+
+    @property
+    def board(self) -> Tuple[Tuple[int, ...], ...]:
+        """Grid view of the bitboards (rows of `cells`), for display and UI code."""
+        cells = self.cells
+        return tuple(cells[r * BOARD_SIZE:(r + 1) * BOARD_SIZE] for r in range(BOARD_SIZE))
+
+    def _cell(self, bit: int) -> int:
+        if self.x & bit:
+            return PLAYER_X
+        if self.o & bit:
+            return PLAYER_O
+        return EMPTY
+
+    def get_opponent(self) -> int:
+        """Return the opponent of the current player."""
+        return -self.current_player
 
     def get_legal_actions(self) -> List[Tuple[int, int]]:
         """
         Return list of legal (row, col) moves for the current player.
         Empty cells are legal moves.
         """
-        actions = []
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                if self.board[r][c] == EMPTY:
-                    actions.append((r, c))
-        return actions
+        return list(self._iter_legal())
+
+    def _iter_legal(self) -> Iterator[Tuple[int, int]]:
+        """Yield legal (row, col) moves without building a list."""
+        for cell in LEGAL_MOVES[self.x | self.o]:
+            yield CELL_TO_RC[cell]
 
     def is_terminal(self) -> bool:
         """
         Terminal state: someone has won or the board is full (draw).
         """
-        if self._has_winner() is not None:
-            return True
-        return all(
-            self.board[r][c] != EMPTY
-            for r in range(BOARD_SIZE)
-            for c in range(BOARD_SIZE)
-        )
+        return self._has_winner() is not None or (self.x | self.o) == FULL_BOARD
 
-    def _has_winner(self) -> Optional[str]:
-        """Return winner symbol (X or O) if any, else None."""
-        for line in WIN_LINES:
-            symbols = [self.board[r][c] for r, c in line]
-            if symbols[0] != EMPTY and all(s == symbols[0] for s in symbols):
-                return symbols[0]
-        return None
+    def _has_winner(self) -> Optional[int]:
+        """
+        Return winner (PLAYER_X or PLAYER_O) if any, else None.
+        Computed once per state (states are immutable) and cached.
+        """
+        winner = self._winner
+        if winner is _UNCOMPUTED:
+            if IS_WIN[self.x]:
+                winner = PLAYER_X
+            elif IS_WIN[self.o]:
+                winner = PLAYER_O
+            else:
+                winner = None
+            self._winner = winner
+        return winner
 
-    def utility(self, perspective: str) -> int:
+    def utility(self, perspective: int) -> int:
         """
         Utility from the perspective of 'perspective' (X or O).
-        Convention: +1 win, -1 loss, 0 draw.
-        Used by Minimax; we evaluate from the maximizer's view (AI = O).
+        Convention: +1 win, -1 loss, 0 draw (the game-level result).
+        The search does not call this; it scores terminal positions on the
+        integer WIN_SCORE / LOSS_SCORE / DRAW_SCORE scale.
         """
         winner = self._has_winner()
         if winner is None:
@@ -105,30 +253,16 @@ class GameState:
             return 1
         return -1
 
-    def heuristic_eval(self, perspective: str) -> float:
+    def heuristic_eval(self, perspective: int) -> int:
         """
         Heuristic evaluation for non-terminal states (for depth-limited Minimax).
-        Scores each line: 2 of perspective + 1 empty = strong; 1 of perspective + 2 empty = weak;
-        same for opponent (negative). Returns value in [-1, 1] range.
+        Scores each line: 2 of perspective + 1 empty = strong (50); 1 of perspective
+        + 2 empty = weak (10); same for opponent (negative).
+        Returns an int in [-HEURISTIC_MAX, HEURISTIC_MAX] = [-100, 100].
         """
-        score = 0.0
-        opponent = PLAYER_O if perspective == PLAYER_X else PLAYER_X
-        for line in WIN_LINES:
-            cells = [self.board[r][c] for r, c in line]
-            n_perspective = cells.count(perspective)
-            n_opponent = cells.count(opponent)
-            n_empty = cells.count(EMPTY)
-            if n_opponent == 0:
-                if n_perspective == 2 and n_empty == 1:
-                    score += 0.5   # one move from win
-                elif n_perspective == 1 and n_empty == 2:
-                    score += 0.1   # potential
-            if n_perspective == 0:
-                if n_opponent == 2 and n_empty == 1:
-                    score -= 0.5   # block opponent
-                elif n_opponent == 1 and n_empty == 2:
-                    score -= 0.1
-        return max(-1.0, min(1.0, score))
+        if perspective == PLAYER_X:
+            return line_heuristic(self.x, self.o)
+        return line_heuristic(self.o, self.x)
 
     def result(self, action: Tuple[int, int]) -> "GameState":
         """
@@ -136,18 +270,19 @@ class GameState:
         Does not modify self.
         """
         r, c = action
-        if self.board[r][c] != EMPTY:
+        bit = 1 << (r * BOARD_SIZE + c)
+        if (self.x | self.o) & bit:
             raise ValueError(f"Invalid action: cell ({r},{c}) is not empty")
-        new_board = deepcopy(self.board)
-        new_board[r][c] = self.current_player
-        next_player = self.get_opponent()
-        return GameState(board=new_board, current_player=next_player)
+        if self.current_player == PLAYER_X:
+            return GameState(self.x | bit, self.o, PLAYER_O)
+        return GameState(self.x, self.o | bit, PLAYER_X)
 
     def display(self) -> str:
         """String representation of the board for CLI display."""
         lines = []
+        board = self.board
         for r in range(BOARD_SIZE):
-            row_str = " | ".join(self.board[r])
+            row_str = " | ".join(SYMBOLS[cell] for cell in board[r])
             lines.append(row_str)
             if r < BOARD_SIZE - 1:
                 lines.append("-" * (BOARD_SIZE * 4 - 3))
@@ -6,11 +6,12 @@ Graphical UI for Tic-Tac-Toe vs Minimax AI
 - Restart to play again.
 """
 
+import threading
 import tkinter as tk
 from tkinter import font as tkfont, messagebox
 from typing import Optional, List, Tuple
 
-from game import GameState, PLAYER_X, PLAYER_O, EMPTY
+from game import GameState, PLAYER_X, PLAYER_O, WIN_LINES, WIN_MASKS
 from minimax import MinimaxAgent
 
 
@@ -48,7 +49,7 @@ class TicTacToeGUI:
         self.ai_symbol = PLAYER_O
         self.human_first = True
         self.cell_buttons: List[List[tk.Button]] = []
-        self.winning_line: Optional[List[Tuple[int, int]]] = None
+        self.winning_line: Optional[Tuple[Tuple[int, int], ...]] = None
 
         self._build_ui()
         self._center_window()
@@ -306,9 +307,10 @@ class TicTacToeGUI:
     def _refresh_board(self) -> None:
         if self.state is None:
             return
+        board = self.state.board
         for r in range(3):
             for c in range(3):
-                sym = self.state.board[r][c]
+                sym = board[r][c]
                 btn = self.cell_buttons[r][c]
                 if sym == PLAYER_X:
                     btn.config(text="X", fg=X_COLOR)
@@ -354,13 +356,50 @@ class TicTacToeGUI:
     def _ai_move(self) -> None:
         if self.state is None or self.state.is_terminal() or self.agent is None:
             return
-        move = self.agent.get_action(self.state, self.ai_symbol)
-        if move is None:
+        # Search on a worker thread so the window stays responsive; Tk is only
+        # touched again from the main thread in _apply_ai_move.
+        threading.Thread(
+            target=self._compute_ai_move,
+            args=(self.state, self.agent, self.ai_symbol),
+            daemon=True,
+        ).start()
+
+    def _compute_ai_move(self, state: GameState, agent: MinimaxAgent, ai_symbol: int) -> None:
+        try:
+            move = agent.get_action(state, ai_symbol)
+        except Exception as exc:  # report on the Tk thread instead of dying silently
+            self.root.after(0, lambda e=exc: self._ai_move_failed(state, agent, e))
+            return
+        nodes = agent.get_nodes_expanded()
+        from_table = agent.last_move_from_table()
+        self.root.after(0, lambda: self._apply_ai_move(state, agent, move, nodes, from_table))
+
+    def _ai_move_failed(self, state: GameState, agent: MinimaxAgent, exc: Exception) -> None:
+        if state is not self.state or agent is not self.agent:
+            return
+        self.status_label.config(text="AI failed to move — start a New Game", fg=TEXT_MUTED)
+        messagebox.showerror("AI Error", f"The AI could not choose a move:\n{exc}")
+
+    def _apply_ai_move(
+        self,
+        state: GameState,
+        agent: MinimaxAgent,
+        move: Optional[Tuple[int, int]],
+        nodes: int,
+        from_table: bool,
+    ) -> None:
+        # Ignore results from a game that was restarted while the AI was thinking.
+        if move is None or state is not self.state or agent is not self.agent:
             return
-        nodes = self.agent.get_nodes_expanded()
-        depth_info = f" [depth limit: {self.agent.max_depth}]" if self.agent.max_depth is not None else ""
-        self.metrics_label.config(text=f"Nodes expanded (last move): {nodes}{depth_info}")
-        self.state = self.state.result(move)
+        if not from_table:
+            depth_info = f" [depth limit: {agent.max_depth}]" if agent.max_depth is not None else ""
+            metrics = f"Nodes expanded (last move): {nodes}{depth_info}"
+        elif nodes:
+            metrics = f"Perfect-play table built: {nodes} positions solved"
+        else:
+            metrics = "Last move: perfect-play table lookup"
+        self.metrics_label.config(text=metrics)
+        self.state = state.result(move)
         self._refresh_board()
         self._update_status()
         if self.state.is_terminal():
@@ -382,13 +421,12 @@ class TicTacToeGUI:
     def _highlight_win_line(self) -> None:
         if self.state is None:
             return
-        from game import WIN_LINES
         winner = self.state._has_winner()
         if winner is None:
             return
-        for line in WIN_LINES:
-            symbols = [self.state.board[r][c] for r, c in line]
-            if symbols[0] != EMPTY and all(s == symbols[0] for s in symbols):
+        bits = self.state.x if winner == PLAYER_X else self.state.o
+        for mask, line in zip(WIN_MASKS, WIN_LINES):
+            if bits & mask == mask:
                 self.winning_line = line
                 for r, c in line:
                     self.cell_buttons[r][c].configure(bg=WIN_BG, fg=WIN_FG)
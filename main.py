@@ -74,7 +74,13 @@ def run_game(
             if move is None:
                 break
             if show_metrics:
-                print(f"  [AI expanded {agent.get_nodes_expanded()} nodes]")
+                nodes = agent.get_nodes_expanded()
+                if not agent.last_move_from_table():
+                    print(f"  [AI expanded {nodes} nodes]")
+                elif nodes:
+                    print(f"  [AI built perfect-play table: {nodes} positions solved]")
+                else:
+                    print("  [AI move from perfect-play table]")
             print(f"AI plays: {move[0]} {move[1]}")
 
         state = state.result(move)
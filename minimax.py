@@ -1,13 +1,156 @@
 """
 Minimax Algorithm Implementation
 
-- Recursive Minimax with clear max/min player distinction.
-- Terminal states evaluated via game utility function.
+- Recursive Minimax in negamax form: a position is scored from the view of the
+  player to move, and a child's score is negated for its parent.
+- Terminal states scored WIN_SCORE / LOSS_SCORE / DRAW_SCORE for the player to move.
 - Optional: Alpha-Beta pruning, depth-limited search with heuristic, node metrics.
+- Transposition table: alpha-beta results are reused across move orders, moves
+  and symmetric positions (keys are canonical under the 8 board symmetries).
+- Iterative deepening: each iteration tries the previous best move first.
+- Principal variation search: moves after the first are tried with a null window
+  and only re-searched when they might be better (scores are integers).
+- Search runs on raw bitboards (ints only); no GameState is built per node.
+- Full-depth play uses a perfect-play table built once by solving every reachable
+  position with a memoized exact negamax (_solve).
+- Thread-safe: an agent may be driven from a worker thread (e.g. off the UI thread).
 """
 
-from typing import Tuple, Optional
-from game import GameState, PLAYER_X, PLAYER_O
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, Tuple, Optional
+from game import (
+    GameState,
+    PLAYER_X,
+    PLAYER_O,
+    BOARD_SIZE,
+    FULL_BOARD,
+    IS_WIN,
+    LEGAL_MOVES,
+    POPCOUNT,
+    SYMMETRIES,
+    SYM_INVERSE,
+    canonical_key,
+    line_heuristic,
+    WIN_SCORE,
+    LOSS_SCORE,
+    DRAW_SCORE,
+)
+
+# Scores are integers (see game.WIN_SCORE) so null windows (alpha, alpha + 1) work.
+INF = WIN_SCORE + 1  # search bound beyond any score
+
+# Transposition-table entry flags: stored value is exact, a lower bound or an upper bound.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Static move ordering by cell index (r * 3 + c): center, then corners, then edges.
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+# ORDERED_MOVES[occupied] is LEGAL_MOVES[occupied] sorted by MOVE_ORDER.
+ORDERED_MOVES = tuple(tuple(sorted(moves, key=MOVE_ORDER.index)) for moves in LEGAL_MOVES)
+
+
+def _ordered_moves(occupied: int, first: int) -> Iterator[int]:
+    """
+    Yield empty cells of `occupied` by static rank, with `first` (e.g. a TT best
+    move, -1 for none) in front. No list is built.
+    """
+    if first >= 0:
+        yield first
+    for cell in ORDERED_MOVES[occupied]:
+        if cell != first:
+            yield cell
+
+
+def _position_key(mine: int, theirs: int, side: int) -> Tuple[int, int]:
+    """
+    Canonical key of a position given the mover's and opponent's bitboards and the
+    side to move, plus the symmetry used (to map stored moves back to this board).
+    """
+    board_key, sym = canonical_key(mine, theirs)
+    return (board_key << 1) | (side == PLAYER_O), sym
+
+
+def _distinct_root_moves(mine: int, theirs: int, side: int, first: int) -> Iterator[int]:
+    """
+    Like _ordered_moves, but skip moves whose resulting position is a symmetric
+    copy of one already yielded (e.g. 9 moves on the empty board -> 3).
+    """
+    seen = set()
+    for cell in _ordered_moves(mine | theirs, first):
+        key, _ = _position_key(theirs, mine | (1 << cell), -side)
+        if key not in seen:
+            seen.add(key)
+            yield cell
+
+
+def _terminal_value(mine: int, theirs: int) -> Optional[int]:
+    """Utility (WIN_SCORE / LOSS_SCORE / DRAW_SCORE) for the player to move if terminal, else None."""
+    if IS_WIN[theirs]:
+        return LOSS_SCORE
+    if IS_WIN[mine]:
+        return WIN_SCORE
+    if (mine | theirs) == FULL_BOARD:
+        return DRAW_SCORE
+    return None
+
+
+@lru_cache(maxsize=None)
+def _solve(mine: int, theirs: int) -> int:
+    """
+    Exact game value for the player to move (full depth, full window).
+    A pure function of the bitboards, so every position is solved once.
+    """
+    terminal = _terminal_value(mine, theirs)
+    if terminal is not None:
+        return terminal
+    return max(-_solve(theirs, mine | (1 << cell)) for cell in ORDERED_MOVES[mine | theirs])
+
+
+# Perfect-play table for full-depth search: position key -> best cell
+# (in the canonical frame). Filled on first use by _ensure_policy.
+_POLICY: Dict[int, int] = {}
+_POLICY_LOCK = threading.Lock()
+
+
+def _ensure_policy() -> int:
+    """
+    Build _POLICY once, even if several threads ask for it at the same time.
+    Returns the number of positions solved by this call (0 if already built).
+    """
+    if _POLICY:
+        return 0
+    with _POLICY_LOCK:
+        if _POLICY:
+            return 0
+        policy: Dict[int, int] = {}
+        solved = _build_policy(policy)
+        _POLICY.update(policy)
+        return solved
+
+
+def _build_policy(policy: Dict[int, int]) -> int:
+    """
+    Solve every non-terminal position reachable from the empty board into `policy`.
+    Returns the number of positions newly solved (expanded) by _solve.
+    """
+    misses_before = _solve.cache_info().misses
+    stack = [(0, 0, PLAYER_X)]
+    while stack:
+        mine, theirs, side = stack.pop()
+        key, sym = _position_key(mine, theirs, side)
+        if key in policy or _terminal_value(mine, theirs) is not None:
+            continue
+        best_value = -INF
+        best_cell = -1
+        for cell in ORDERED_MOVES[mine | theirs]:
+            child = theirs, mine | (1 << cell)
+            value = -_solve(*child)
+            if value > best_value:
+                best_value = value
+                best_cell = cell
+            stack.append((*child, -side))
+        policy[key] = SYMMETRIES[sym][best_cell]
+    return _solve.cache_info().misses - misses_before
 
 
 class MinimaxAgent:
@@ -17,6 +160,8 @@ class MinimaxAgent:
     Supports Alpha-Beta pruning and optional depth limit with heuristic evaluation.
     """
 
+    __slots__ = ("use_alpha_beta", "max_depth", "nodes_expanded", "from_table", "tt", "_lock")
+
     def __init__(
         self,
         use_alpha_beta: bool = True,
@@ -25,114 +170,187 @@ class MinimaxAgent:
         self.use_alpha_beta = use_alpha_beta
         self.max_depth = max_depth  # None = search to terminal (full depth)
         self.nodes_expanded = 0
+        self.from_table = False  # last move was read from the perfect-play table
+        # key -> (value for side to move, remaining depth, flag, best cell in
+        # canonical frame); kept across get_action calls
+        self.tt: Dict[int, Tuple[int, int, int, int]] = {}
+        # Serializes get_action so the TT and node count stay consistent across threads
+        self._lock = threading.Lock()
 
-    def get_action(self, state: GameState, maximizing_player: str) -> Optional[Tuple[int, int]]:
+    def get_action(self, state: GameState, maximizing_player: int) -> Optional[Tuple[int, int]]:
         """
         Return best action for the current player (maximizing_player)
         from the given state. Uses Minimax (with optional alpha-beta and depth limit).
         """
+        if maximizing_player != state.current_player:
+            raise ValueError("maximizing_player must be the player to move")
+        with self._lock:
+            return self._get_action(state)
+
+    def _get_action(self, state: GameState) -> Optional[Tuple[int, int]]:
         self.nodes_expanded = 0
+        self.from_table = False
         legal = state.get_legal_actions()
         if not legal:
             return None
 
-        best_value = float("-inf")
-        best_action = None
-        depth = 0
+        side = state.current_player
+        if side == PLAYER_X:
+            mine, theirs = state.x, state.o
+        else:
+            mine, theirs = state.o, state.x
 
-        for action in legal:
-            successor = state.result(action)
-            if self.use_alpha_beta:
-                value = self._minimax_alpha_beta(
-                    successor, maximizing_player, float("-inf"), float("inf"), False, depth + 1
-                )
-            else:
-                value = self._minimax(successor, maximizing_player, False, depth + 1)
+        if self.use_alpha_beta:
+            if self.max_depth is None:
+                # The move that builds the table reports the positions it solved
+                self.nodes_expanded = _ensure_policy()
+                key, sym = _position_key(mine, theirs, side)
+                cell = _POLICY.get(key)
+                if cell is not None:
+                    self.from_table = True
+                    return divmod(SYM_INVERSE[sym][cell], BOARD_SIZE)
+            best_cell = self._best_cell(mine, theirs, side, self.max_depth)
+            return divmod(best_cell, BOARD_SIZE)
+
+        best_value = -INF
+        best_cell = -1
+        for cell in _distinct_root_moves(mine, theirs, side, -1):
+            value = -self._minimax(theirs, mine | (1 << cell), 1)
             if value > best_value:
                 best_value = value
-                best_action = action
-        return best_action
+                best_cell = cell
+        return divmod(best_cell, BOARD_SIZE)
 
-    def _eval(self, state: GameState, maximizing_player: str) -> float:
-        """Terminal: utility; non-terminal at depth limit: heuristic."""
-        if state.is_terminal():
-            return float(state.utility(maximizing_player))
-        return state.heuristic_eval(maximizing_player)
+    def _best_cell(self, mine: int, theirs: int, side: int, max_depth: Optional[int]) -> int:
+        """Iterative-deepening alpha-beta; the final iteration is the requested search."""
+        n_empty = POPCOUNT[~(mine | theirs) & FULL_BOARD]
+        # At least one iteration, so max_depth <= 0 still scores root children
+        # with the heuristic (as the plain search does) instead of returning no move.
+        limit = n_empty if max_depth is None else max(1, min(max_depth, n_empty))
+        best_cell = -1
+        for d in range(1, limit + 1):
+            best_cell = self._search_root(mine, theirs, side, best_cell, d)
+        return best_cell
 
-    def _minimax(
-        self,
-        state: GameState,
-        maximizing_player: str,
-        is_max_turn: bool,
-        depth: int = 0,
-    ) -> float:
+    def _search_root(self, mine: int, theirs: int, side: int, first: int, limit: int) -> int:
+        """One alpha-beta (PVS) iteration to depth `limit`; returns the best root cell."""
+        best_value = -INF
+        best_cell = -1
+        for cell in _distinct_root_moves(mine, theirs, side, first):
+            child = theirs, mine | (1 << cell)
+            if best_cell < 0:
+                value = -self._negamax(*child, -side, -INF, INF, 1, limit)
+            else:
+                value = -self._negamax(*child, -side, -best_value - 1, -best_value, 1, limit)
+                if value > best_value:
+                    value = -self._negamax(*child, -side, -INF, -value, 1, limit)
+            if value > best_value:
+                best_value = value
+                best_cell = cell
+        return best_cell
+
+    def _minimax(self, mine: int, theirs: int, depth: int) -> int:
         """
-        Recursive Minimax. Optional depth limit with heuristic at cutoff.
+        Recursive Minimax (negamax form, no pruning). Optional depth limit with
+        heuristic at cutoff. Returns the value for the player to move (mine).
         """
         self.nodes_expanded += 1
-        if state.is_terminal() or (self.max_depth is not None and depth >= self.max_depth):
-            return self._eval(state, maximizing_player)
+        terminal = _terminal_value(mine, theirs)
+        if terminal is not None:
+            return terminal
+        if self.max_depth is not None and depth >= self.max_depth:
+            return line_heuristic(mine, theirs)
 
-        legal = state.get_legal_actions()
-        if is_max_turn:
-            value = float("-inf")
-            for action in legal:
-                successor = state.result(action)
-                value = max(value, self._minimax(successor, maximizing_player, False, depth + 1))
-            return value
-        else:
-            value = float("inf")
-            for action in legal:
-                successor = state.result(action)
-                value = min(value, self._minimax(successor, maximizing_player, True, depth + 1))
-            return value
+        value = -INF
+        for cell in ORDERED_MOVES[mine | theirs]:
+            value = max(value, -self._minimax(theirs, mine | (1 << cell), depth + 1))
+        return value
 
-    def _minimax_alpha_beta(
+    def _negamax(
         self,
-        state: GameState,
-        maximizing_player: str,
-        alpha: float,
-        beta: float,
-        is_max_turn: bool,
-        depth: int = 0,
-    ) -> float:
+        mine: int,
+        theirs: int,
+        side: int,
+        alpha: int,
+        beta: int,
+        depth: int,
+        limit: int,
+    ) -> int:
         """
-        Minimax with Alpha-Beta pruning. Optional depth limit with heuristic at cutoff.
+        Negamax with Alpha-Beta pruning on bitboards, to depth `limit` with heuristic
+        at cutoff. mine / theirs are the bitboards of the player to move (side) and
+        the opponent; the value returned is from the mover's view.
+        After the first move, children get a null window and are re-searched with
+        the full window only if they fail high inside (alpha, beta).
+        Results are stored in the transposition table with an EXACT/LOWER/UPPER flag;
+        the stored best move is searched first on later visits.
         """
+        remaining = limit - depth
+        key, sym = _position_key(mine, theirs, side)
+        entry = self.tt.get(key)
+        tt_best = -1
+        if entry is not None:
+            value, entry_depth, flag, best_cell = entry
+            if best_cell >= 0:
+                tt_best = SYM_INVERSE[sym][best_cell]
+            if entry_depth >= remaining:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
         self.nodes_expanded += 1
-        if state.is_terminal() or (self.max_depth is not None and depth >= self.max_depth):
-            return self._eval(state, maximizing_player)
+        terminal = _terminal_value(mine, theirs)
+        if terminal is not None:
+            return terminal
+        if remaining <= 0:
+            return line_heuristic(mine, theirs)
 
-        legal = state.get_legal_actions()
-        if is_max_turn:
-            value = float("-inf")
-            for action in legal:
-                successor = state.result(action)
-                value = max(
-                    value,
-                    self._minimax_alpha_beta(
-                        successor, maximizing_player, alpha, beta, False, depth + 1
-                    ),
+        alpha_orig = alpha
+        value = -INF
+        best_cell = -1
+        for cell in _ordered_moves(mine | theirs, tt_best):
+            child = theirs, mine | (1 << cell)
+            if best_cell < 0:
+                child_value = -self._negamax(*child, -side, -beta, -alpha, depth + 1, limit)
+            else:
+                child_value = -self._negamax(
+                    *child, -side, -alpha - 1, -alpha, depth + 1, limit
                 )
-                alpha = max(alpha, value)
-                if beta <= alpha:
-                    break
-            return value
+                if alpha < child_value < beta:
+                    child_value = -self._negamax(
+                        *child, -side, -beta, -child_value, depth + 1, limit
+                    )
+            if child_value > value:
+                value = child_value
+                best_cell = cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if value <= alpha_orig:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
         else:
-            value = float("inf")
-            for action in legal:
-                successor = state.result(action)
-                value = min(
-                    value,
-                    self._minimax_alpha_beta(
-                        successor, maximizing_player, alpha, beta, True, depth + 1
-                    ),
-                )
-                beta = min(beta, value)
-                if beta <= alpha:
-                    break
-            return value
+            flag = EXACT
+        if best_cell >= 0:
+            best_cell = SYMMETRIES[sym][best_cell]
+        self.tt[key] = (value, remaining, flag, best_cell)
+        return value
 
     def get_nodes_expanded(self) -> int:
         """Return number of nodes expanded in the last get_action call."""
         return self.nodes_expanded
+
+    def last_move_from_table(self) -> bool:
+        """
+        Return True if the last get_action call answered from the perfect-play
+        table; nodes_expanded is then the positions solved to build the table
+        (0 once it already existed), not a search of this position.
+        """
+        return self.from_table